@@ -1,29 +1,39 @@
-from crewai import Agent, Task, Crew
-import yaml
+from crewai import Agent, Task, Crew, LLM
 import os
-from langchain_groq import ChatGroq
+import threading
+import time
+from src.agents import rate_limit
+from src.utils import yaml_fast
+
+try:
+    from crewai.events import crewai_event_bus, LLMStreamChunkEvent
+except ImportError:  # crewai releases before the events package was split out
+    from crewai.utilities.events import crewai_event_bus, LLMStreamChunkEvent
+
+def _freeze_config(config):
+    # Cached configs are shared by every caller, so hand out read-only views
+    return yaml_fast.freeze(config or {})
 
 def load_agents_config():
     # Corrected path to be relative to this file's location
     config_path = os.path.join(os.path.dirname(__file__), '../../config/agents.yaml')
-    with open(config_path, 'r') as f:
-        return yaml.safe_load(f)
+    return yaml_fast.load_cached(config_path, _freeze_config)
 
 def load_tasks_config():
     # Corrected path to be relative to this file's location
     config_path = os.path.join(os.path.dirname(__file__), '../../config/tasks.yaml')
-    with open(config_path, 'r') as f:
-        return yaml.safe_load(f)
+    return yaml_fast.load_cached(config_path, _freeze_config)
 
 def create_crew(topic, web_search_tool, web_scraper_tool, pinecone_retriever_tool):
     # Create a single agent that does both research and writing to stay within rate limits
-    llm = ChatGroq(
+    llm = LLM(
         model="groq/llama-3.1-8b-instant",
-        temperature=0.5,
-        max_tokens=2048,  # Enough for complete response
+        temperature=0.1,  # Near-deterministic output for factual reports
+        max_tokens=1024,  # The short report fits; larger limits mostly burn quota
         api_key=os.getenv("GROQ_API_KEY"),
-        max_retries=2,
-        request_timeout=120,
+        timeout=120,
+        max_retries=2,  # Passed through to the client for transient API errors
+        stream=True,  # Emits LLMStreamChunkEvent per token as the report is generated
     )
     
     # Single agent that does research AND writing
@@ -60,30 +70,44 @@ def create_crew(topic, web_search_tool, web_scraper_tool, pinecone_retriever_too
         verbose=True
     )
 
+# Reserved per run before the actual usage is known (matches max_tokens)
+ESTIMATED_RUN_TOKENS = 1024
+
+_BUCKET = rate_limit.TokenBucket(rate_limit.REQUESTS_PER_MINUTE, rate_limit.TOKENS_PER_MINUTE)
+
+# The event bus is process-wide: scoped_handlers() swaps out every handler on entry and
+# restores them on exit, so concurrent runs (e.g. two Streamlit sessions) would drop each
+# other's handlers. Runs take turns instead.
+_RUN_LOCK = threading.Lock()
+
 # Usage
-def run_research(topic, web_search_tool, web_scraper_tool, pinecone_retriever_tool):
-    import time
-    
+def run_research(topic, web_search_tool, web_scraper_tool, pinecone_retriever_tool, on_token=None):
+    """Run the crew, passing each streamed LLM chunk to on_token if given"""
     crew = create_crew(topic, web_search_tool, web_scraper_tool, pinecone_retriever_tool)
     
     print("\n🔄 Starting single-agent research workflow...")
     print("ℹ️  Using 1 agent (instead of 2) to stay within rate limits\n")
     
-    # Brief cooldown to ensure clean rate limit state
-    initial_cooldown = 15
-    print(f"⏱️  Waiting {initial_cooldown}s...\n")
-    time.sleep(initial_cooldown)
-    
-    max_retries = 2
-    retry_delay = 60  # 60 seconds between retries
+    max_retries = 5
     
     for attempt in range(max_retries):
         try:
-            if attempt > 0:
-                print(f"\n⏳ Attempt {attempt + 1}/{max_retries} - Cooling down for {retry_delay}s...")
-                time.sleep(retry_delay)
+            reservation = _BUCKET.wait_for(ESTIMATED_RUN_TOKENS)
+            llm = crew.agents[0].llm
+            with _RUN_LOCK, crewai_event_bus.scoped_handlers():
+                if on_token:
+                    @crewai_event_bus.on(LLMStreamChunkEvent)
+                    def _forward_chunk(source, event):
+                        # Only this run's LLM; other emitters share the bus
+                        if source is llm:
+                            on_token(event.chunk)
+                
+                result = crew.kickoff(inputs={'topic': topic})
             
-            result = crew.kickoff(inputs={'topic': topic})
+            # Charge the bucket with real usage when the crew reports it
+            token_usage = getattr(result, 'token_usage', None)
+            if getattr(token_usage, 'total_tokens', None):
+                _BUCKET.record(reservation, token_usage.total_tokens)
             print("\n✅ Research completed successfully!")
             return result
             
@@ -93,7 +117,8 @@ def run_research(topic, web_search_tool, web_scraper_tool, pinecone_retriever_to
             # Check for rate limit errors
             if 'rate_limit' in error_str or 'ratelimit' in error_str:
                 if attempt < max_retries - 1:
-                    print(f"\n⚠️  Rate limit hit. Waiting {retry_delay}s for reset...")
+                    retry_delay = rate_limit.retry_delay(attempt, e)
+                    print(f"\n⚠️  Rate limit hit. Waiting {retry_delay:.1f}s for reset...")
                     time.sleep(retry_delay)
                 else:
                     print(f"\n❌ Rate limit exceeded after {max_retries} attempts.")
@@ -106,7 +131,8 @@ def run_research(topic, web_search_tool, web_scraper_tool, pinecone_retriever_to
             elif 'none or empty' in error_str or 'invalid response' in error_str:
                 print(f"\n⚠️  Empty response from LLM (attempt {attempt + 1}/{max_retries})")
                 if attempt < max_retries - 1:
-                    print(f"Waiting {retry_delay}s and retrying...")
+                    retry_delay = rate_limit.retry_delay(attempt, e)
+                    print(f"Waiting {retry_delay:.1f}s and retrying...")
                     time.sleep(retry_delay)
                 else:
                     print("\n❌ Failed to get valid response after retries")
@@ -0,0 +1,94 @@
+import re
+import time
+import random
+import threading
+from collections import deque
+
+# Groq free tier limits for llama-3.1-8b-instant
+REQUESTS_PER_MINUTE = 30
+TOKENS_PER_MINUTE = 6000
+RATE_WINDOW_SECONDS = 60
+BASE_RETRY_DELAY = 1.0
+MAX_RETRY_DELAY = 60.0
+
+_RETRY_AFTER_RE = re.compile(r'retry-after["\':\s]+(\d+(?:\.\d+)?)', re.IGNORECASE)
+_TRY_AGAIN_RE = re.compile(r'try again in (?:(\d+)m)?(\d+(?:\.\d+)?)s', re.IGNORECASE)
+
+class TokenBucket:
+    """Sliding-window limiter admitting calls within request and token budgets
+
+    Callers reserve once per unit of work they gate. run_research reserves per crew
+    kickoff, which issues several LLM calls, so its request budget approximates the
+    provider's per-call RPM limit rather than enforcing it exactly.
+    """
+    
+    def __init__(self, rpm, tpm, window=RATE_WINDOW_SECONDS):
+        self.rpm = rpm
+        self.tpm = tpm
+        self.window = window
+        self.req_ts = deque()
+        self.tok_ts = deque()  # [timestamp, tokens] reservations
+        self._lock = threading.Lock()
+    
+    def _evict(self, now):
+        while self.req_ts and now - self.req_ts[0] >= self.window:
+            self.req_ts.popleft()
+        while self.tok_ts and now - self.tok_ts[0][0] >= self.window:
+            self.tok_ts.popleft()
+    
+    def wait_for(self, estimated_tokens):
+        """Block until a call of estimated_tokens fits both budgets, then reserve it"""
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._evict(now)
+                
+                waits = []
+                if len(self.req_ts) >= self.rpm:
+                    waits.append(self.window - (now - self.req_ts[0]))
+                tokens_used = sum(tokens for _, tokens in self.tok_ts)
+                if self.tok_ts and tokens_used + estimated_tokens > self.tpm:
+                    waits.append(self.window - (now - self.tok_ts[0][0]))
+                if not waits:
+                    reservation = [now, estimated_tokens]
+                    self.req_ts.append(now)
+                    self.tok_ts.append(reservation)
+                    return reservation
+                wait = max(waits)
+            
+            # Sleep unlocked so other callers and record() aren't stalled; budgets are re-checked after
+            print(f"⏱️  Rate budget full. Waiting {wait:.1f}s...\n")
+            time.sleep(wait)
+    
+    def record(self, reservation, actual_tokens):
+        """Replace a reservation's estimate with the tokens actually used"""
+        with self._lock:
+            reservation[1] = actual_tokens
+
+def get_retry_after(error):
+    """Seconds the provider asked us to wait, from headers or the error message"""
+    response = getattr(error, 'response', None)
+    headers = getattr(response, 'headers', None) or {}
+    value = headers.get('retry-after') or headers.get('Retry-After')
+    if value:
+        try:
+            return float(value)
+        except ValueError:
+            pass
+    
+    message = str(error)
+    match = _RETRY_AFTER_RE.search(message)
+    if match:
+        return float(match.group(1))
+    match = _TRY_AGAIN_RE.search(message)
+    if match:
+        return int(match.group(1) or 0) * 60 + float(match.group(2))
+    return None
+
+def retry_delay(attempt, error):
+    """Provider-requested delay if given, else exponential backoff with jitter; both capped"""
+    retry_after = get_retry_after(error)
+    if retry_after is not None:
+        # Never trust the provider for longer than our own backoff ceiling
+        return min(retry_after, MAX_RETRY_DELAY)
+    return min(MAX_RETRY_DELAY, BASE_RETRY_DELAY * 2 ** attempt + random.uniform(0, 1))
@@ -1,5 +1,7 @@
 import streamlit as st
 import os
+import queue
+from concurrent.futures import ThreadPoolExecutor
 from dotenv import load_dotenv
 
 # Load environment variables
@@ -10,6 +12,10 @@ from src.agents.crew_manager import run_research
 from src.tools.serpapi_search_tool import SerpAPISearchTool
 from src.tools.scraper_tool import WebScraperTool
 from src.tools.rag_tool import PineconeRAGTool
+from src.utils.helpers import configure_async_logging
+
+# Keep log I/O off the request path
+configure_async_logging()
 
 # Page config
 st.set_page_config(
@@ -52,6 +58,44 @@ def check_password():
         # Password correct.
         return True
 
+# --- Streaming ---
+
+_STREAM_END = object()
+
+def run_research_streaming(placeholder, *args):
+    """Run the crew on a worker thread, rendering its streamed tokens into placeholder"""
+    # Streamlit elements can only be written from the script thread, so chunks
+    # arriving on crewai's threads are queued and drained here
+    tokens = queue.Queue()
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        future = executor.submit(run_research, *args, on_token=tokens.put)
+        future.add_done_callback(lambda _: tokens.put(_STREAM_END))
+        placeholder.write_stream(iter(tokens.get, _STREAM_END))
+        return future.result()
+
+# --- Cached Resources ---
+# Streamlit reruns this script on every interaction; build expensive clients
+# once per set of API keys instead of on every click.
+
+@st.cache_resource
+def get_pinecone_ops(api_key, environment):
+    return PineconeOperations(api_key=api_key, environment=environment)
+
+@st.cache_resource
+def get_search_tool(serpapi_api_key, pinecone_api_key, environment):
+    return SerpAPISearchTool(
+        api_key=serpapi_api_key,
+        pinecone_ops=get_pinecone_ops(pinecone_api_key, environment)
+    )
+
+@st.cache_resource
+def get_scraper_tool():
+    return WebScraperTool()
+
+@st.cache_resource
+def get_rag_tool(pinecone_api_key, environment):
+    return PineconeRAGTool(pinecone_ops=get_pinecone_ops(pinecone_api_key, environment))
+
 # --- Main Application --- 
 
 # Initialize session state
@@ -91,10 +135,8 @@ with col1:
                 with st.spinner('Agents are working...'):
                     try:
                         # 1. Initialize Pinecone Operations (embeddings are local now)
-                        pinecone_ops = PineconeOperations(
-                            api_key=pinecone_api_key,
-                            environment=os.getenv("PINECONE_ENVIRONMENT", "us-west1-gcp")
-                        )
+                        pinecone_environment = os.getenv("PINECONE_ENVIRONMENT", "us-west1-gcp")
+                        pinecone_ops = get_pinecone_ops(pinecone_api_key, pinecone_environment)
 
                         # 2. Create a job in Pinecone
                         job_info = pinecone_ops.create_research_job(topic)
@@ -102,12 +144,14 @@ with col1:
                         status_placeholder.info(f"Job {job_info['job_id']} created. Agents are starting...")
 
                         # 3. Initialize Tools
-                        search_tool = SerpAPISearchTool(api_key=serpapi_api_key, pinecone_ops=pinecone_ops)
-                        scraper_tool = WebScraperTool()
-                        rag_tool = PineconeRAGTool(pinecone_ops=pinecone_ops)
-
-                        # 4. Run the research crew
-                        result = run_research(topic, search_tool, scraper_tool, rag_tool)
+                        search_tool = get_search_tool(serpapi_api_key, pinecone_api_key, pinecone_environment)
+                        scraper_tool = get_scraper_tool()
+                        rag_tool = get_rag_tool(pinecone_api_key, pinecone_environment)
+
+                        # 4. Run the research crew, streaming tokens while it works
+                        stream_placeholder = st.empty()
+                        result = run_research_streaming(stream_placeholder, topic, search_tool, scraper_tool, rag_tool)
+                        stream_placeholder.empty()
                         
                         # 5. Update job status and show result
                         pinecone_ops.update_research_job(job_id=job_info['job_id'], status='complete', report=result)
@@ -0,0 +1,128 @@
+import os
+import sqlite3
+import hashlib
+import threading
+import numpy as np
+from typing import List, Optional, Tuple
+from src.utils.embeddings import embedding_model_id
+
+# Stay under SQLite's bound-parameter limit in IN (...) lookups
+_SQL_BATCH = 500
+
+CACHE_PATH = os.getenv('EMBEDDING_CACHE_PATH', os.path.join('.cache', 'embeddings.sqlite3'))
+
+def quantize_int8(vector: np.ndarray) -> Tuple[np.ndarray, float]:
+    """Symmetric per-vector int8 quantization: returns (codes, scale) with vector ~= codes * scale"""
+    vector = np.asarray(vector, dtype=np.float32)
+    scale = float(np.abs(vector).max()) / 127 if vector.size else 0.0
+    if not scale:
+        return np.zeros(vector.shape, dtype=np.int8), 1.0
+    return np.clip(np.rint(vector / scale), -127, 127).astype(np.int8), scale
+
+def dequantize(codes: np.ndarray, scale: float) -> np.ndarray:
+    """float32 vector approximated by int8 codes and their scale"""
+    return codes.astype(np.float32) * np.float32(scale)
+
+def _pack(vector: np.ndarray) -> bytes:
+    # int8 codes followed by a float32 scale: dimension + 4 bytes per vector
+    codes, scale = quantize_int8(vector)
+    return codes.tobytes() + np.float32(scale).tobytes()
+
+def _unpack(blob: bytes) -> np.ndarray:
+    return dequantize(np.frombuffer(blob[:-4], dtype=np.int8), np.frombuffer(blob[-4:], dtype=np.float32)[0])
+
+class EmbeddingCache:
+    """Persistent int8-quantized embedding store keyed by sha256(model|text), surviving restarts"""
+
+    def __init__(self, path: str = CACHE_PATH):
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._lock = threading.Lock()
+        with self._lock, self._conn:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS embeddings_i8 ("
+                "key BLOB PRIMARY KEY, model TEXT NOT NULL, vector BLOB NOT NULL)"
+            )
+
+    @staticmethod
+    def _key(text: str, model_name: str) -> bytes:
+        return hashlib.sha256(f"{model_name}|{text}".encode()).digest()
+
+    def get(self, text: str, model_name: str = None) -> Optional[np.ndarray]:
+        """Cached embedding for text, or None on a miss"""
+        model_name = model_name or embedding_model_id()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT vector FROM embeddings_i8 WHERE key = ?", (self._key(text, model_name),)
+            ).fetchone()
+        if row is None:
+            return None
+        return _unpack(row[0])
+
+    def put(self, text: str, vector: np.ndarray, model_name: str = None):
+        """Store an embedding as int8 codes plus a float32 scale"""
+        model_name = model_name or embedding_model_id()
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO embeddings_i8 (key, model, vector) VALUES (?, ?, ?)",
+                (self._key(text, model_name), model_name, _pack(vector))
+            )
+
+    def get_many(self, texts: List[str], model_name: str = None) -> List[Optional[np.ndarray]]:
+        """Cached embeddings for texts, positionally aligned, with None for misses"""
+        model_name = model_name or embedding_model_id()
+        keys = [self._key(text, model_name) for text in texts]
+        found = {}
+        with self._lock:
+            for start in range(0, len(keys), _SQL_BATCH):
+                chunk = keys[start:start + _SQL_BATCH]
+                rows = self._conn.execute(
+                    f"SELECT key, vector FROM embeddings_i8 WHERE key IN ({','.join('?' * len(chunk))})", chunk
+                ).fetchall()
+                found.update(rows)
+        return [_unpack(found[key]) if key in found else None for key in keys]
+
+    def put_many(self, texts: List[str], vectors: np.ndarray, model_name: str = None):
+        """Store several embeddings in a single transaction"""
+        model_name = model_name or embedding_model_id()
+        rows = [
+            (self._key(text, model_name), model_name, _pack(vector))
+            for text, vector in zip(texts, vectors)
+        ]
+        with self._lock, self._conn:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO embeddings_i8 (key, model, vector) VALUES (?, ?, ?)", rows
+            )
+
+    def purge_model(self, model_name: str) -> int:
+        """Drop every embedding produced by model_name (e.g. after a model switch)"""
+        with self._lock, self._conn:
+            return self._conn.execute("DELETE FROM embeddings_i8 WHERE model = ?", (model_name,)).rowcount
+
+_cache = None
+_cache_lock = threading.Lock()
+
+def get_cache() -> EmbeddingCache:
+    """Process-wide cache instance, opened on first use"""
+    global _cache
+    with _cache_lock:
+        if _cache is None:
+            _cache = EmbeddingCache()
+    return _cache
+
+def get(text: str) -> Optional[np.ndarray]:
+    return get_cache().get(text)
+
+def put(text: str, vector: np.ndarray):
+    get_cache().put(text, vector)
+
+def get_many(texts: List[str]) -> List[Optional[np.ndarray]]:
+    return get_cache().get_many(texts)
+
+def put_many(texts: List[str], vectors: np.ndarray):
+    get_cache().put_many(texts, vectors)
+
+def purge_model(model_name: str) -> int:
+    return get_cache().purge_model(model_name)
@@ -1,27 +1,99 @@
 
-from pinecone import Pinecone, ServerlessSpec
-from sentence_transformers import SentenceTransformer
+from pinecone import ServerlessSpec
+from pinecone.grpc import PineconeGRPC
 import json
+import zlib
+import base64
 import hashlib
+import heapq
+import functools
+import numpy as np
+import threading
+from collections import OrderedDict
 from datetime import datetime
 from typing import Dict, Any, List, Optional
+from src.utils.embeddings import load_embedding_model
+from src.pinecone_ops import embedding_cache
+from src.pinecone_ops.query_cache import SemanticQueryCache
+from src.utils.helpers import ErrorType, ResearchError
+
+EMBEDDING_DIMENSION = 384  # all-MiniLM-L6-v2 embeddings
+
+# Job metadata fetched per request when building the job history
+HISTORY_PAGE_SIZE = 1000
+
+# Matches performance.batch_upsert_size in config/pinecone_indexes.yaml
+UPSERT_BATCH_SIZE = 100
+
+# Recently seen job metadata kept in-process to skip fetches on status updates
+JOB_CACHE_SIZE = 512
+
+# Near-duplicate content searches reuse results above this cosine similarity
+QUERY_CACHE_SIZE = 512
+QUERY_CACHE_THRESHOLD = 0.86
+
+# Source text kept in vector metadata. Previews of at least PREVIEW_COMPRESS_MIN_CHARS are
+# stored zlib + base64 encoded, the size where that starts to beat plain text for prose.
+# Today the only writer stores ~200-char SerpAPI snippets, so this path is dormant until
+# scraped full text is stored.
+CONTENT_PREVIEW_CHARS = 1000
+PREVIEW_COMPRESS_MIN_CHARS = 512
+
+# Process-wide embedding model shared by every manager instance
+_MODEL = None
+_MODEL_LOCK = threading.Lock()
+
+def _get_model():
+    global _MODEL
+    with _MODEL_LOCK:
+        if _MODEL is None:
+            print("[INFO] Loading embedding model...")
+            _MODEL = load_embedding_model()
+            print("[INFO] Embedding model loaded successfully")
+    return _MODEL
+
+@functools.lru_cache(maxsize=4096)
+def _embed_cached(text: str) -> np.ndarray:
+    """Memoized single-text float32 embedding (read-only, since it is shared)"""
+    # Fall back to the on-disk cache before running the model
+    embedding = embedding_cache.get(text)
+    if embedding is None:
+        embedding = np.asarray(
+            _get_model().encode(text, convert_to_numpy=True, normalize_embeddings=True), dtype=np.float32
+        )
+        embedding_cache.put(text, embedding)
+    embedding.setflags(write=False)
+    return embedding
+
+def _preview_metadata(content: str) -> Dict[str, str]:
+    """Metadata field holding a source preview, zlib + base64 encoded when long enough to pay off"""
+    preview = content[:CONTENT_PREVIEW_CHARS]
+    if len(preview) < PREVIEW_COMPRESS_MIN_CHARS:
+        return {'content_preview': preview}
+    return {'content_preview_zb64': base64.b64encode(zlib.compress(preview.encode())).decode()}
+
+def _expand_preview(metadata: Dict) -> Dict:
+    """Replace a compressed preview with a plain 'content_preview' field"""
+    packed = metadata.pop('content_preview_zb64', None)
+    if packed is not None:
+        metadata['content_preview'] = zlib.decompress(base64.b64decode(packed)).decode()
+    return metadata
 
 class PineconeDataManager:
     """Unified Pinecone manager for all data storage"""
     
     def __init__(self, api_key: str, environment: str, google_api_key: str = None):
-        self.pc = Pinecone(api_key=api_key)
+        # gRPC client: multiplexed connections and async upserts
+        self.pc = PineconeGRPC(api_key=api_key)
         self.environment = environment
         
-        # Initialize sentence-transformer model for embeddings (local, no API needed)
-        print("[INFO] Loading embedding model (sentence-transformers)...")
-        self.embedding_model = SentenceTransformer('all-MiniLM-L6-v2')
-        print("[INFO] Embedding model loaded successfully")
+        # Shared local embedding model (no API needed); see EMBEDDING_BACKEND
+        self.embedding_model = _get_model()
         
-        # Define indexes for different data types
+        # Define indexes for different data types (v2: unit-norm vectors, dotproduct metric)
         self.indexes = {
-            'research_jobs': 'cognito-jobs',      # Job metadata and status
-            'research_content': 'cognito-content',  # Research content and sources
+            'research_jobs': 'cognito-jobs-v2',      # Job metadata and status
+            'research_content': 'cognito-content-v2',  # Research content and sources
         }
         
         # Initialize indexes if they don't exist
@@ -35,8 +107,8 @@ class PineconeDataManager:
             if pinecone_name not in existing_indexes:
                 self.pc.create_index(
                     name=pinecone_name,
-                    dimension=384,  # all-MiniLM-L6-v2 embeddings
-                    metric='cosine',
+                    dimension=EMBEDDING_DIMENSION,
+                    metric='dotproduct',  # equals cosine on normalized embeddings
                     spec=ServerlessSpec(
                         cloud='aws',
                         region='us-east-1'
@@ -47,70 +119,144 @@ class PineconeDataManager:
         self.job_index = self.pc.Index(self.indexes['research_jobs'])
         self.content_index = self.pc.Index(self.indexes['research_content'])
     
-    def _generate_embedding(self, text: str) -> List[float]:
-        """Generate embedding for text using sentence-transformers"""
-        # Generate embedding using local model (no API calls)
-        embedding = self.embedding_model.encode(text, convert_to_numpy=True)
-        return embedding.tolist()
+    def _generate_embedding(self, text: str) -> np.ndarray:
+        """Generate a float32 embedding for text using the local model (memoized per text)"""
+        return _embed_cached(text)
+    
+    def _generate_embeddings_batch(self, texts: List[str], batch_size: int = 64) -> np.ndarray:
+        """Embed many texts into one (len(texts), dim) float32 array, running the model only on cache misses"""
+        embeddings = np.empty((len(texts), EMBEDDING_DIMENSION), dtype=np.float32)
+        
+        missing = {}
+        for row, cached in enumerate(embedding_cache.get_many(texts)):
+            if cached is None:
+                missing.setdefault(texts[row], []).append(row)
+            else:
+                embeddings[row] = cached
+        
+        # Encode each distinct uncached text once, in a single batched call
+        if missing:
+            misses = list(missing)
+            encoded = np.asarray(self.embedding_model.encode(
+                misses, batch_size=batch_size, convert_to_numpy=True, show_progress_bar=False,
+                normalize_embeddings=True
+            ), dtype=np.float32)
+            embedding_cache.put_many(misses, encoded)
+            for text, embedding in zip(misses, encoded):
+                embeddings[missing[text]] = embedding
+        
+        return embeddings
     
-    def _generate_job_id(self, topic: str, job_type: str = 'research') -> str:
+    def _upsert_batched(self, index, vectors: List[Dict], namespace: str):
+        """Upsert vectors in fixed-size chunks, which the client sends concurrently over gRPC"""
+        if not vectors:
+            return
+        
+        try:
+            response = index.upsert(
+                vectors=vectors, namespace=namespace, batch_size=UPSERT_BATCH_SIZE, show_progress=False
+            )
+        except Exception as e:
+            raise ResearchError(
+                ErrorType.PINECONE_ERROR,
+                f"Upsert failed in namespace '{namespace}': {e}",
+                details={'namespace': namespace, 'errors': [str(e)]}
+            ) from e
+        
+        # Failed chunks are reported in the response rather than raised
+        if response.errors:
+            raise ResearchError(
+                ErrorType.PINECONE_ERROR,
+                f"{response.failed_batch_count} of {response.total_batch_count} upsert batches failed "
+                f"in namespace '{namespace}'",
+                details={'namespace': namespace, 'errors': [error.error_message for error in response.errors]}
+            )
+    
+    def _generate_job_id(self, topic: str, job_type: str = 'research', timestamp: str = None) -> str:
         """Generate unique job ID"""
-        timestamp = datetime.now().isoformat()
+        timestamp = timestamp or datetime.now().isoformat()
         content = f"{job_type}_{topic}_{timestamp}"
-        return hashlib.md5(content.encode()).hexdigest()[:12]
+        return hashlib.blake2b(content.encode(), digest_size=6).hexdigest()
 
 # Research Job Management
-class ResearchJobManager(PineconeDataManager):
+class ResearchJobManager:
     """Manage research jobs in Pinecone"""
     
+    def __init__(self, base: PineconeDataManager):
+        self.base = base
+        self._job_cache: OrderedDict = OrderedDict()
+        # The manager is shared across Streamlit sessions, so cache access is serialized
+        self._job_cache_lock = threading.Lock()
+    
+    def _cache_job(self, job_id: str, job_metadata: Dict):
+        """Remember job metadata, evicting the least recently used entries"""
+        with self._job_cache_lock:
+            self._job_cache[job_id] = job_metadata
+            self._job_cache.move_to_end(job_id)
+            while len(self._job_cache) > JOB_CACHE_SIZE:
+                self._job_cache.popitem(last=False)
+    
+    def _cached_job(self, job_id: str) -> Optional[Dict]:
+        """Cached metadata for job_id, or None if it isn't cached"""
+        with self._job_cache_lock:
+            return self._job_cache.get(job_id)
+    
     def create_job(self, topic: str, user_id: str = 'anonymous') -> Dict[str, str]:
         """Create new research job"""
-        job_id = self._generate_job_id(topic, 'research')
-        namespace = f"job_{job_id}"
+        return self.create_jobs([topic], user_id)[0]
+    
+    def create_jobs(self, topics: List[str], user_id: str = 'anonymous') -> List[Dict[str, str]]:
+        """Create several research jobs with one batched embedding pass and upsert"""
+        created_at = datetime.now().isoformat()
         
-        # Create job metadata
-        job_metadata = {
-            'job_id': job_id,
-            'topic': topic,
-            'user_id': user_id,
-            'job_type': 'research',
-            'status': 'pending',
-            'created_at': datetime.now().isoformat(),
-            'updated_at': datetime.now().isoformat(),
-            'namespace': namespace,
-            'source_count': 0,
-            'processing_time_seconds': 0,
-            'report': '',
-            'error_message': ''
-        }
+        jobs = []
+        for i, topic in enumerate(topics):
+            # Position in the batch keeps IDs distinct for repeated topics
+            job_id = self.base._generate_job_id(topic, 'research', f"{created_at}#{i}")
+            jobs.append({
+                'job_id': job_id,
+                'topic': topic,
+                'user_id': user_id,
+                'job_type': 'research',
+                'status': 'pending',
+                'created_at': created_at,
+                'updated_at': created_at,
+                'namespace': f"job_{job_id}",
+                'source_count': 0,
+                'processing_time_seconds': 0,
+                'report': '',
+                'error_message': ''
+            })
         
-        # Generate embedding from topic and metadata
-        embedding_text = f"Research job: {topic} Status: pending Type: research"
-        embedding = self._generate_embedding(embedding_text)
+        # Generate embeddings from topic and metadata
+        embeddings = self.base._generate_embeddings_batch(
+            [f"Research job: {topic} Status: pending Type: research" for topic in topics]
+        )
         
         # Store in Pinecone
-        self.job_index.upsert(
-            vectors=[{
-                'id': job_id,
-                'values': embedding,
-                'metadata': job_metadata
-            }],
-            namespace='jobs'
-        )
+        self.base._upsert_batched(self.base.job_index, [
+            {'id': job['job_id'], 'values': embedding.tolist(), 'metadata': job}
+            for job, embedding in zip(jobs, embeddings)
+        ], namespace='jobs')
         
-        return {'job_id': job_id, 'namespace': namespace}
+        for job in jobs:
+            self._cache_job(job['job_id'], job)
+        return [{'job_id': job['job_id'], 'namespace': job['namespace']} for job in jobs]
     
     def update_job_status(self, job_id: str, status: str, report: str = None, 
                          error_message: str = None, source_count: int = None) -> bool:
         """Update job status and results"""
         try:
-            # Get current job data
-            job_data = self.get_job(job_id)
-            if not job_data:
-                return False
+            # Get current job data, from the local cache when possible
+            job_metadata = self._cached_job(job_id)
+            if job_metadata is None:
+                job_data = self.get_job(job_id)
+                if not job_data:
+                    return False
+                job_metadata = job_data['metadata']
             
             # Update metadata
-            updated_metadata = job_data['metadata'].copy()
+            updated_metadata = dict(job_metadata)
             updated_metadata.update({
                 'status': status,
                 'updated_at': datetime.now().isoformat()
@@ -128,18 +274,16 @@ class ResearchJobManager(PineconeDataManager):
             if report:
                 embedding_text += f" Report: {report[:500]}"  # Truncate for embedding
             
-            embedding = self._generate_embedding(embedding_text)
+            embedding = self.base._generate_embedding(embedding_text)
             
             # Update in Pinecone
-            self.job_index.upsert(
-                vectors=[{
-                    'id': job_id,
-                    'values': embedding,
-                    'metadata': updated_metadata
-                }],
-                namespace='jobs'
-            )
+            self.base._upsert_batched(self.base.job_index, [{
+                'id': job_id,
+                'values': embedding.tolist(),
+                'metadata': updated_metadata
+            }], namespace='jobs')
             
+            self._cache_job(job_id, updated_metadata)
             return True
             
         except Exception as e:
@@ -149,46 +293,41 @@ class ResearchJobManager(PineconeDataManager):
     def get_job(self, job_id: str) -> Optional[Dict]:
         """Get job by ID"""
         try:
-            response = self.job_index.fetch(ids=[job_id], namespace='jobs')
+            response = self.base.job_index.fetch(ids=[job_id], namespace='jobs')
             # New Pinecone API returns object with .vectors attribute
             if hasattr(response, 'vectors') and job_id in response.vectors:
-                return response.vectors[job_id]
+                job_data = response.vectors[job_id]
+                self._cache_job(job_id, dict(job_data['metadata']))
+                return job_data
             return None
         except Exception as e:
             print(f"Error fetching job {job_id}: {e}")
             return None
     
     def get_job_history(self, user_id: str = None, limit: int = 10) -> List[Dict]:
-        """Get job history using similarity search"""
+        """Get the most recent jobs, optionally for one user"""
         try:
-            # Search query for job history
+            job_filter = {'job_type': {'$eq': 'research'}}
             if user_id:
-                query_text = f"Research jobs for user {user_id} job history"
-            else:
-                query_text = "Research job history all jobs"
-            
-            query_embedding = self._generate_embedding(query_text)
-            
-            response = self.job_index.query(
-                vector=query_embedding,
-                top_k=limit,
-                include_metadata=True,
-                namespace='jobs',
-                filter={'job_type': {'$eq': 'research'}} if not user_id else {
-                    'job_type': {'$eq': 'research'},
-                    'user_id': {'$eq': user_id}
-                }
-            )
+                job_filter['user_id'] = {'$eq': user_id}
             
+            # Page through every matching job's metadata; recency is only known client-side
             jobs = []
-            for match in response['matches']:
-                job_data = match['metadata']
-                job_data['score'] = match['score']
-                jobs.append(job_data)
+            pagination_token = None
+            while True:
+                page = self.base.job_index.fetch_by_metadata(
+                    filter=job_filter,
+                    namespace='jobs',
+                    limit=HISTORY_PAGE_SIZE,
+                    pagination_token=pagination_token
+                )
+                jobs.extend(dict(vector['metadata']) for vector in page.vectors.values())
+                if page.pagination is None or not page.pagination.next:
+                    break
+                pagination_token = page.pagination.next
             
-            # Sort by creation date
-            jobs.sort(key=lambda x: x['created_at'], reverse=True)
-            return jobs
+            # Newest first
+            return heapq.nlargest(limit, jobs, key=lambda job: job['created_at'])
             
         except Exception as e:
             print(f"Error fetching job history: {e}")
@@ -197,10 +336,10 @@ class ResearchJobManager(PineconeDataManager):
     def search_jobs_by_topic(self, search_topic: str, limit: int = 10) -> List[Dict]:
         """Search jobs by topic similarity"""
         try:
-            query_embedding = self._generate_embedding(f"Research topic: {search_topic}")
+            query_embedding = self.base._generate_embedding(f"Research topic: {search_topic}")
             
-            response = self.job_index.query(
-                vector=query_embedding,
+            response = self.base.job_index.query(
+                vector=query_embedding.tolist(),
                 top_k=limit,
                 include_metadata=True,
                 namespace='jobs'
@@ -219,61 +358,79 @@ class ResearchJobManager(PineconeDataManager):
             return []
 
 # Source and Content Management
-class ContentManager(PineconeDataManager):
+class ContentManager:
     """Manage research content and sources in Pinecone"""
     
+    def __init__(self, base: PineconeDataManager):
+        self.base = base
+        self._query_cache = SemanticQueryCache(EMBEDDING_DIMENSION, QUERY_CACHE_SIZE, QUERY_CACHE_THRESHOLD)
+    
     def store_source(self, job_id: str, url: str, title: str, content: str, 
                     credibility_score: float = 0.5) -> str:
         """Store research source in Pinecone"""
-        source_id = f"{job_id}_{hashlib.md5(url.encode()).hexdigest()[:8]}"
-        
-        source_metadata = {
-            'source_id': source_id,
-            'job_id': job_id,
+        return self.store_sources(job_id, [{
             'url': url,
             'title': title,
-            'content_preview': content[:1000],  # First 1000 chars for metadata
-            'credibility_score': credibility_score,
-            'scraped_at': datetime.now().isoformat(),
-            'content_length': len(content),
-            'source_type': 'web_article'
-        }
+            'content': content,
+            'credibility_score': credibility_score
+        }])[0]
+    
+    def store_sources(self, job_id: str, items: List[Dict[str, Any]]) -> List[str]:
+        """Store several research sources with one batched encode and one upsert"""
+        if not items:
+            return []
         
-        # Generate embedding from content
-        embedding_text = f"Title: {title} Content: {content}"
-        embedding = self._generate_embedding(embedding_text)
+        # Generate all embeddings in a single batched pass
+        texts = [f"Title: {item['title']} Content: {item['content']}" for item in items]
+        embeddings = self.base._generate_embeddings_batch(texts)
         
-        # Store in content index
-        self.content_index.upsert(
-            vectors=[{
+        scraped_at = datetime.now().isoformat()
+        vectors = []
+        for item, embedding in zip(items, embeddings):
+            url, content = item['url'], item['content']
+            source_id = f"{job_id}_{hashlib.blake2b(url.encode(), digest_size=4).hexdigest()}"
+            
+            source_metadata = {
+                'source_id': source_id,
+                'job_id': job_id,
+                'url': url,
+                'title': item['title'],
+                **_preview_metadata(content),
+                'credibility_score': item.get('credibility_score', 0.5),
+                'scraped_at': scraped_at,
+                'content_length': len(content),
+                'source_type': 'web_article'
+            }
+            
+            vectors.append({
                 'id': source_id,
-                'values': embedding,
+                'values': embedding.tolist(),  # Serialized per row only at the Pinecone boundary
                 'metadata': source_metadata
-            }],
-            namespace=f"job_{job_id}"
-        )
+            })
         
-        return source_id
+        # Store in content index
+        self.base._upsert_batched(self.base.content_index, vectors, namespace=f"job_{job_id}")
+        self._query_cache.invalidate(f"job_{job_id}")
+        
+        return [vector['id'] for vector in vectors]
     
     def get_job_sources(self, job_id: str, limit: int = 10) -> List[Dict]:
         """Get all sources for a job"""
         try:
-            # Query for sources in job namespace
-            query_embedding = self._generate_embedding("research sources content")
+            namespace = f"job_{job_id}"
             
-            response = self.content_index.query(
-                vector=query_embedding,
-                top_k=limit,
-                include_metadata=True,
-                namespace=f"job_{job_id}"
-            )
+            # Enumerate source IDs in the job namespace, then fetch their metadata
+            source_ids = []
+            for page in self.base.content_index.list(namespace=namespace, limit=min(limit, 100)):
+                source_ids.extend(item.id for item in page.vectors)
+                if len(source_ids) >= limit:
+                    break
             
-            sources = []
-            for match in response['matches']:
-                source_data = match['metadata']
-                sources.append(source_data)
+            if not source_ids:
+                return []
             
-            return sources
+            response = self.base.content_index.fetch(ids=source_ids[:limit], namespace=namespace)
+            return [_expand_preview(dict(vector['metadata'])) for vector in response.vectors.values()]
             
         except Exception as e:
             print(f"Error fetching sources for job {job_id}: {e}")
@@ -282,12 +439,18 @@ class ContentManager(PineconeDataManager):
     def search_content(self, query: str, job_id: str = None, top_k: int = 5) -> List[Dict]:
         """Search content using semantic similarity"""
         try:
-            query_embedding = self._generate_embedding(query)
+            query_embedding = self.base._generate_embedding(query)
             
             namespace = f"job_{job_id}" if job_id else None
             
-            response = self.content_index.query(
-                vector=query_embedding,
+            # Reuse results of a near-identical earlier search
+            cache_scope = (namespace, top_k)
+            cached = self._query_cache.lookup(query_embedding, cache_scope)
+            if cached is not None:
+                return cached
+            
+            response = self.base.content_index.query(
+                vector=query_embedding.tolist(),
                 top_k=top_k,
                 include_metadata=True,
                 namespace=namespace
@@ -295,10 +458,11 @@ class ContentManager(PineconeDataManager):
             
             results = []
             for match in response['matches']:
-                content_data = match['metadata']
+                content_data = _expand_preview(match['metadata'])
                 content_data['relevance_score'] = match['score']
                 results.append(content_data)
             
+            self._query_cache.insert(query_embedding, cache_scope, results)
             return results
             
         except Exception as e:
@@ -310,13 +474,19 @@ class PineconeOperations:
     """Helper class for common Pinecone operations"""
     
     def __init__(self, api_key: str, environment: str, google_api_key: str = None):
-        self.research_manager = ResearchJobManager(api_key, environment, google_api_key)
-        self.content_manager = ContentManager(api_key, environment, google_api_key)
+        # One shared client, model and set of index handles for both managers
+        self.base = PineconeDataManager(api_key, environment, google_api_key)
+        self.research_manager = ResearchJobManager(self.base)
+        self.content_manager = ContentManager(self.base)
     
     def create_research_job(self, topic: str, user_id: str = 'anonymous') -> Dict[str, str]:
         """Create new research job"""
         return self.research_manager.create_job(topic, user_id)
     
+    def create_research_jobs(self, topics: List[str], user_id: str = 'anonymous') -> List[Dict[str, str]]:
+        """Create several research jobs in one batch"""
+        return self.research_manager.create_jobs(topics, user_id)
+    
     def update_research_job(self, job_id: str, status: str, **kwargs) -> bool:
         """Update research job status"""
         return self.research_manager.update_job_status(job_id, status, **kwargs)
@@ -0,0 +1,103 @@
+import threading
+import numpy as np
+from typing import Any, Dict, Hashable, List, Optional, Tuple
+from src.pinecone_ops.embedding_cache import quantize_int8
+
+class SemanticQueryCache:
+    """Serve search results for queries whose embeddings are near-duplicates of a cached one"""
+
+    def __init__(self, dimension: int, capacity: int = 512, threshold: float = 0.86):
+        self.capacity = capacity
+        self.threshold = threshold
+        # Cached query embeddings as int8 codes with a per-row scale (4x smaller than float32)
+        self._centroids = np.zeros((capacity, dimension), dtype=np.int8)
+        self._scales = np.zeros(capacity, dtype=np.float32)
+        self._scope_ids = np.full(capacity, -1, dtype=np.int64)  # -1 marks a free slot
+        self._last_used = np.zeros(capacity, dtype=np.int64)
+        self._results: List[Optional[List[Dict]]] = [None] * capacity
+        self._scopes: Dict[Hashable, int] = {}  # only scopes with cached entries
+        self._next_scope_id = 0
+        self._size = 0
+        self._clock = 0
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _normalize(embedding) -> np.ndarray:
+        vector = np.asarray(embedding, dtype=np.float32)
+        norm = np.linalg.norm(vector)
+        return vector / norm if norm else vector
+
+    def _scope_id(self, scope: Hashable) -> int:
+        scope_id = self._scopes.get(scope)
+        if scope_id is None:
+            scope_id = self._scopes[scope] = self._next_scope_id
+            self._next_scope_id += 1
+        return scope_id
+
+    def _drop_scope_if_unused(self, scope_id: int):
+        if np.any(self._scope_ids[:self._size] == scope_id):
+            return
+        for scope, sid in self._scopes.items():
+            if sid == scope_id:
+                del self._scopes[scope]
+                break
+
+    def lookup(self, embedding, scope: Tuple[Any, ...]) -> Optional[List[Dict]]:
+        """Results cached for the most similar query in the same scope, if similar enough"""
+        codes, scale = quantize_int8(self._normalize(embedding))
+        with self._lock:
+            scope_id = self._scopes.get(scope)
+            if scope_id is None:
+                return None
+
+            # One int32-accumulated matrix-vector product scores every cached query
+            dots = self._centroids[:self._size].astype(np.int32) @ codes.astype(np.int32)
+            scores = dots.astype(np.float32) * (self._scales[:self._size] * np.float32(scale))
+            scores[self._scope_ids[:self._size] != scope_id] = -np.inf
+            best = int(np.argmax(scores))
+            if scores[best] < self.threshold:
+                return None
+
+            self._clock += 1
+            self._last_used[best] = self._clock
+            return [dict(result) for result in self._results[best]]
+
+    def insert(self, embedding, scope: Tuple[Any, ...], results: List[Dict]):
+        """Cache results for a query, evicting the least recently used entry when full"""
+        codes, scale = quantize_int8(self._normalize(embedding))
+        with self._lock:
+            free = np.flatnonzero(self._scope_ids[:self._size] == -1)
+            if free.size:
+                slot = int(free[0])
+            elif self._size < self.capacity:
+                slot = self._size
+                self._size += 1
+            else:
+                slot = int(np.argmin(self._last_used[:self._size]))
+            evicted = int(self._scope_ids[slot])
+
+            self._clock += 1
+            self._centroids[slot] = codes
+            self._scales[slot] = scale
+            self._scope_ids[slot] = self._scope_id(scope)
+            self._last_used[slot] = self._clock
+            self._results[slot] = [dict(result) for result in results]
+            if evicted != -1:
+                self._drop_scope_if_unused(evicted)
+
+    def clear(self):
+        """Drop every cached entry"""
+        with self._lock:
+            self._scope_ids[:self._size] = -1
+            self._results[:self._size] = [None] * self._size
+            self._scopes.clear()
+
+    def invalidate(self, namespace: Optional[str]):
+        """Drop entries whose results may change after writes to namespace"""
+        with self._lock:
+            # Searches without a namespace span every job, so they are always stale
+            stale = [scope for scope in self._scopes if scope[0] in (namespace, None)]
+            stale_ids = [self._scopes.pop(scope) for scope in stale]
+            for slot in np.flatnonzero(np.isin(self._scope_ids[:self._size], stale_ids)):
+                self._scope_ids[slot] = -1
+                self._results[slot] = None
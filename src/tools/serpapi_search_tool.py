@@ -1,55 +1,71 @@
 from crewai.tools import BaseTool
-from serpapi import GoogleSearch
+import requests
+from requests.adapters import HTTPAdapter
 from typing import List, Dict, Any, Optional
-from pydantic import Field
+from pydantic import Field, PrivateAttr
 
 from src.pinecone_ops.operations import PineconeOperations
 
+SERPAPI_SEARCH_URL = "https://serpapi.com/search.json"
+SERPAPI_TIMEOUT_SECONDS = 15
+
+# Precomputed 1/position relevance scores for result positions 1..100
+MAX_RANKED_POSITION = 100
+_POSITION_RELEVANCE = (0.0,) + tuple(1 / position for position in range(1, MAX_RANKED_POSITION + 1))
+
+def _create_session() -> requests.Session:
+    """HTTP session with pooled keep-alive connections to SerpAPI"""
+    session = requests.Session()
+    session.mount("https://", HTTPAdapter(pool_maxsize=4))
+    return session
+
 class SerpAPISearchTool(BaseTool):
     name: str = "Web Search Tool"
     description: str = "Search the web for information on a given topic using SerpAPI"
     api_key: str = Field(..., description="SerpAPI API key")
     pinecone_ops: Optional[PineconeOperations] = Field(default=None, description="Pinecone operations instance")
+    _session: requests.Session = PrivateAttr(default_factory=_create_session)
 
     def _run(self, query: str, job_id: str = None, max_results: int = 5) -> List[Dict]:
         """Execute web search and store results in Pinecone"""
         
         params = {
+            "engine": "google",
             "q": query,
             "api_key": self.api_key,
             "num": max_results
         }
 
-        search = GoogleSearch(params)
-        results = search.get_dict()
+        # Reuse the tool's session so repeat searches skip the TLS handshake
+        response = self._session.get(SERPAPI_SEARCH_URL, params=params, timeout=SERPAPI_TIMEOUT_SECONDS)
+        response.raise_for_status()
+        results = response.json()
         
         formatted_results = self._format_results(results)
 
         # Store results in Pinecone if job_id provided
         if job_id and self.pinecone_ops and formatted_results:
-            for result in formatted_results:
-                # The 'content' is not available in SerpAPI results, so we use the snippet.
-                self.pinecone_ops.content_manager.store_source(
-                    job_id=job_id,
-                    url=result.get('url'),
-                    title=result.get('title'),
-                    content=result.get('snippet', ''),
-                    credibility_score=result.get('relevance_score', 0.5)
-                )
+            # The 'content' is not available in SerpAPI results, so we use the snippet.
+            self.pinecone_ops.content_manager.store_sources(job_id, [{
+                'url': result.get('url'),
+                'title': result.get('title'),
+                'content': result.get('snippet', ''),
+                'credibility_score': result.get('relevance_score', 0.5)
+            } for result in formatted_results])
         
         return formatted_results
 
     def _format_results(self, raw_results: Dict) -> List[Dict]:
         """Format API results for agent consumption"""
-        formatted = []
-        if "organic_results" in raw_results:
-            for result in raw_results.get("organic_results", []):
-                formatted.append({
-                    'url': result.get('link', ''),
-                    'title': result.get('title', ''),
-                    'snippet': result.get('snippet', ''),
-                    # SerpAPI does not provide full content, so snippet is used as a fallback.
-                    'content': result.get('snippet', ''), 
-                    'relevance_score': 1 / result.get('position', 1) # Using position as a proxy for relevance
-                })
-        return formatted
+        return [
+            {
+                'url': result.get('link', ''),
+                'title': result.get('title', ''),
+                'snippet': (snippet := result.get('snippet', '')),
+                # SerpAPI does not provide full content, so snippet is used as a fallback.
+                'content': snippet,
+                # Using position as a proxy for relevance
+                'relevance_score': _POSITION_RELEVANCE[max(1, min(result.get('position') or 1, MAX_RANKED_POSITION))]
+            }
+            for result in raw_results.get("organic_results", [])
+        ]
@@ -1,6 +1,47 @@
-import yaml
 import pinecone
-from typing import Dict, Any, List
+from dataclasses import dataclass
+from types import MappingProxyType
+from typing import Dict, Any, List, Mapping, Optional, Tuple
+from src.utils import yaml_fast
+
+@dataclass(slots=True, frozen=True)
+class PineconeIndexCfg:
+    """Settings for a single Pinecone index"""
+    name: str
+    dimension: int
+    metric: str
+    replicas: int = 1
+    shards: int = 1
+    indexed_metadata: Tuple[str, ...] = ()
+
+@dataclass(slots=True, frozen=True)
+class PineconeCfg:
+    """Parsed Pinecone configuration (config/pinecone_indexes.yaml)"""
+    indexes: Mapping[str, PineconeIndexCfg]
+    namespaces: Mapping[str, str]
+    cleanup: Mapping[str, Any]
+    performance: Mapping[str, Any]
+
+    @classmethod
+    def from_dict(cls, raw: Optional[Dict[str, Any]]) -> 'PineconeCfg':
+        """Build the frozen configuration from the raw YAML dict (None for an empty file)"""
+        raw = raw or {}
+        indexes = {}
+        for key, index in (raw.get('indexes') or {}).items():
+            indexes[key] = PineconeIndexCfg(
+                name=index['name'],
+                dimension=index['dimension'],
+                metric=index['metric'],
+                replicas=index.get('replicas', 1),
+                shards=index.get('shards', 1),
+                indexed_metadata=tuple((index.get('metadata_config') or {}).get('indexed', ()))
+            )
+        return cls(
+            indexes=MappingProxyType(indexes),
+            namespaces=MappingProxyType(dict(raw.get('namespaces') or {})),
+            cleanup=MappingProxyType(dict(raw.get('cleanup') or {})),
+            performance=MappingProxyType(dict(raw.get('performance') or {}))
+        )
 
 class PineconeConfigManager:
     def __init__(self, config_path='config/pinecone_indexes.yaml'):
@@ -8,13 +49,16 @@ class PineconeConfigManager:
         self.config = self.load_config()
         self.initialized_indexes = {}
     
-    def load_config(self) -> Dict[str, Any]:
+    def load_config(self) -> PineconeCfg:
         """Load Pinecone configuration from YAML"""
         try:
-            with open(self.config_path, 'r') as f:
-                return yaml.safe_load(f)
+            return yaml_fast.load_cached(self.config_path, self._build_config)
         except FileNotFoundError:
-            return self.get_default_config()
+            return self._build_config(None)
+    
+    def _build_config(self, raw: Optional[Dict[str, Any]]) -> PineconeCfg:
+        # A missing or empty file falls back to the defaults
+        return PineconeCfg.from_dict(raw or self.get_default_config())
     
     def get_default_config(self) -> Dict[str, Any]:
         """Return default Pinecone configuration"""
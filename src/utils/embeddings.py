@@ -0,0 +1,83 @@
+import os
+import numpy as np
+from typing import List, Union
+
+MODEL_NAME = 'all-MiniLM-L6-v2'
+ONNX_MODEL_ID = f'sentence-transformers/{MODEL_NAME}'
+ONNX_MODEL_DIR = os.path.expanduser(f'~/.cache/cognito-agent/{MODEL_NAME}-int8')
+ONNX_MODEL_FILE = 'model_quantized.onnx'
+
+class OnnxEmbeddingModel:
+    """int8-quantized ONNX Runtime build of all-MiniLM-L6-v2 with a SentenceTransformer-style encode()"""
+
+    def __init__(self, model_dir: str = ONNX_MODEL_DIR, max_seq_length: int = 256):
+        from optimum.onnxruntime import ORTModelForFeatureExtraction, ORTQuantizer
+        from optimum.onnxruntime.configuration import AutoQuantizationConfig
+        from transformers import AutoTokenizer
+
+        # Export and dynamically quantize once, then reuse the saved model
+        if not os.path.exists(os.path.join(model_dir, ONNX_MODEL_FILE)):
+            model = ORTModelForFeatureExtraction.from_pretrained(ONNX_MODEL_ID, export=True)
+            quantizer = ORTQuantizer.from_pretrained(model)
+            quantization_config = AutoQuantizationConfig.avx512_vnni(is_static=False, per_channel=False)
+            quantizer.quantize(save_dir=model_dir, quantization_config=quantization_config)
+            AutoTokenizer.from_pretrained(ONNX_MODEL_ID).save_pretrained(model_dir)
+
+        self.tokenizer = AutoTokenizer.from_pretrained(model_dir)
+        self.model = ORTModelForFeatureExtraction.from_pretrained(model_dir, file_name=ONNX_MODEL_FILE)
+        self.max_seq_length = max_seq_length
+
+    def encode(self, sentences: Union[str, List[str]], batch_size: int = 32,
+               normalize_embeddings: bool = False, convert_to_numpy: bool = True, **kwargs):
+        """Mean-pooled float32 embeddings (1-D for a single string), like SentenceTransformer.encode"""
+        single = isinstance(sentences, str)
+        texts = [sentences] if single else list(sentences)
+
+        batches = []
+        for start in range(0, len(texts), batch_size):
+            inputs = self.tokenizer(
+                texts[start:start + batch_size],
+                padding=True,
+                truncation=True,
+                max_length=self.max_seq_length,
+                return_tensors='np'
+            )
+            token_embeddings = self.model(**inputs).last_hidden_state
+
+            # Mean pooling over non-padding tokens
+            mask = inputs['attention_mask'][..., np.newaxis].astype(np.float32)
+            pooled = (token_embeddings * mask).sum(axis=1) / np.clip(mask.sum(axis=1), 1e-9, None)
+            if normalize_embeddings:
+                pooled /= np.clip(np.linalg.norm(pooled, axis=1, keepdims=True), 1e-12, None)
+            batches.append(pooled.astype(np.float32))
+
+        if batches:
+            embeddings = np.concatenate(batches)
+        else:
+            embeddings = np.empty((0, self.model.config.hidden_size), dtype=np.float32)
+        if single:
+            return embeddings[0]
+        # SentenceTransformer returns a list of per-sentence vectors without convert_to_numpy
+        return embeddings if convert_to_numpy else list(embeddings)
+
+def embedding_model_id() -> str:
+    """Identifier of the configured model variant, used to key cached embeddings"""
+    if os.getenv('EMBEDDING_BACKEND', 'sentence-transformers').lower() == 'onnx':
+        return f'{MODEL_NAME}:onnx-int8'
+    torch_dtype = os.getenv('EMBEDDING_TORCH_DTYPE')
+    return f'{MODEL_NAME}:{torch_dtype}' if torch_dtype else MODEL_NAME
+
+def load_embedding_model():
+    """Load the embedding model for the configured EMBEDDING_BACKEND"""
+    backend = os.getenv('EMBEDDING_BACKEND', 'sentence-transformers').lower()
+    if backend == 'onnx':
+        return OnnxEmbeddingModel()
+
+    from sentence_transformers import SentenceTransformer
+
+    # Optionally keep weights in half precision (e.g. float16/bfloat16) to halve resident memory
+    torch_dtype = os.getenv('EMBEDDING_TORCH_DTYPE')
+    if torch_dtype:
+        import torch
+        return SentenceTransformer(MODEL_NAME, model_kwargs={'torch_dtype': getattr(torch, torch_dtype)})
+    return SentenceTransformer(MODEL_NAME)
@@ -1,7 +1,59 @@
+import atexit
 import logging
+import queue
+import threading
 from enum import Enum
-from typing import Optional, Dict, Any
-from src.pinecone_ops.operations import PineconeOperations
+from logging.handlers import QueueHandler, QueueListener
+from types import MappingProxyType
+from typing import TYPE_CHECKING, Optional, Dict, Any, Mapping, Protocol
+
+if TYPE_CHECKING:
+    from src.pinecone_ops.operations import PineconeOperations
+
+_LOGGER = logging.getLogger(__name__)
+
+class _DropOldestQueueHandler(QueueHandler):
+    """QueueHandler that discards the oldest queued record instead of blocking when full"""
+    
+    def enqueue(self, record):
+        while True:
+            try:
+                self.queue.put_nowait(record)
+                return
+            except queue.Full:
+                try:
+                    self.queue.get_nowait()
+                except queue.Empty:
+                    pass
+
+class _DrainingQueueListener(QueueListener):
+    """QueueListener whose shutdown sentinel waits for room in a full queue"""
+    
+    def enqueue_sentinel(self):
+        self.queue.put(self._sentinel)
+
+_listener: Optional[QueueListener] = None
+_listener_lock = threading.Lock()
+
+def configure_async_logging(max_queue_size: int = 10000) -> QueueListener:
+    """Route root logger output through a queue drained by a background thread"""
+    global _listener
+    with _listener_lock:
+        # Idempotent: Streamlit re-executes the app script on every rerun
+        if _listener is not None:
+            return _listener
+        
+        root = logging.getLogger()
+        handlers = root.handlers[:] or [logging.StreamHandler()]
+        for handler in root.handlers[:]:
+            root.removeHandler(handler)
+        
+        log_queue = queue.Queue(max_queue_size)
+        root.addHandler(_DropOldestQueueHandler(log_queue))
+        _listener = _DrainingQueueListener(log_queue, *handlers, respect_handler_level=True)
+        _listener.start()
+        atexit.register(_listener.stop)
+        return _listener
 
 class ErrorType(Enum):
     NETWORK_ERROR = "network_error"
@@ -12,23 +64,52 @@ class ErrorType(Enum):
     TIMEOUT_ERROR = "timeout_error"
     EMBEDDING_ERROR = "embedding_error"
 
+# Plain-dict lookup of each member's value, avoiding the enum descriptor on the hot path
+_ERROR_TYPE_VALUES: Mapping[ErrorType, str] = MappingProxyType({member: member.value for member in ErrorType})
+
+_USER_MESSAGES: Mapping[ErrorType, str] = MappingProxyType({
+    ErrorType.NETWORK_ERROR: "Unable to connect to external services. Please try again later.",
+    ErrorType.API_ERROR: "External API is currently unavailable. Please try again later.",
+    ErrorType.PARSING_ERROR: "Unable to process the retrieved content. Please try a different topic.",
+    ErrorType.PINECONE_ERROR: "Vector database error. Please contact support.",
+    ErrorType.AGENT_ERROR: "AI agent encountered an error. Please try again with a more specific topic.",
+    ErrorType.TIMEOUT_ERROR: "Request timed out. Please try again or contact support.",
+    ErrorType.EMBEDDING_ERROR: "Text embedding generation failed. Please try again."
+})
+
 class ResearchError(Exception):
+    __slots__ = ("error_type", "message", "details")
+    
     def __init__(self, error_type: ErrorType, message: str, details: Optional[Dict] = None):
         self.error_type = error_type
         self.message = message
         self.details = details or {}
         super().__init__(self.message)
 
+class JobStatusUpdater(Protocol):
+    """Callable that records a job's status, e.g. a bound update_job_status method"""
+    
+    def __call__(self, job_id: str, status: str, error_message: Optional[str] = None) -> Any: ...
+
+def _no_sql_manager(job_id: str, status: str, error_message: Optional[str] = None):
+    raise AttributeError("No SQL job manager is configured")
+
 class PineconeErrorHandler:
-    def __init__(self, pinecone_ops: PineconeOperations):
+    def __init__(self, pinecone_ops: "PineconeOperations"):
         self.pinecone_ops = pinecone_ops
-        self.logger = logging.getLogger(__name__)
+        
+        # Job status updaters keyed by 4-char job ID prefix, bound once
+        sql_manager = getattr(pinecone_ops, 'sql_manager', None)
+        self._updaters: Dict[str, JobStatusUpdater] = {
+            "sql_": sql_manager.update_sql_job if sql_manager is not None else _no_sql_manager
+        }
+        self._default_updater: JobStatusUpdater = pinecone_ops.research_manager.update_job_status
     
     def handle_error(self, job_id: str, error: Exception) -> Dict[str, Any]:
         """Handle and log errors, update job status in Pinecone"""
-        if isinstance(error, ResearchError):
+        if error.__class__ is ResearchError:
             error_info = {
-                "type": error.error_type.value,
+                "type": _ERROR_TYPE_VALUES[error.error_type],
                 "message": error.message,
                 "details": error.details
             }
@@ -40,36 +121,20 @@ class PineconeErrorHandler:
             }
         
         # Log error
-        self.logger.error(f"Job {job_id} failed: {error_info}")
+        _LOGGER.error("Job %s failed: %s", job_id, error_info)
         
         # Update job status in Pinecone
         try:
-            if job_id.startswith('sql_'):
-                self.pinecone_ops.sql_manager.update_sql_job(
-                    job_id=job_id,
-                    status="error",
-                    error_message=error_info["message"]
-                )
-            else:
-                self.pinecone_ops.research_manager.update_job_status(
-                    job_id=job_id,
-                    status="error",
-                    error_message=error_info["message"]
-                )
+            self._updaters.get(job_id[:4], self._default_updater)(
+                job_id=job_id,
+                status="error",
+                error_message=error_info["message"]
+            )
         except Exception as update_error:
-            self.logger.error(f"Failed to update job status: {update_error}")
+            _LOGGER.error("Failed to update job status: %s", update_error)
         
         return error_info
     
     def get_user_friendly_message(self, error_type: ErrorType) -> str:
         """Get user-friendly error messages"""
-        messages = {
-            ErrorType.NETWORK_ERROR: "Unable to connect to external services. Please try again later.",
-            ErrorType.API_ERROR: "External API is currently unavailable. Please try again later.",
-            ErrorType.PARSING_ERROR: "Unable to process the retrieved content. Please try a different topic.",
-            ErrorType.PINECONE_ERROR: "Vector database error. Please contact support.",
-            ErrorType.AGENT_ERROR: "AI agent encountered an error. Please try again with a more specific topic.",
-            ErrorType.TIMEOUT_ERROR: "Request timed out. Please try again or contact support.",
-            ErrorType.EMBEDDING_ERROR: "Text embedding generation failed. Please try again."
-        }
-        return messages.get(error_type, "An unexpected error occurred. Please try again.")
+        return _USER_MESSAGES.get(error_type, "An unexpected error occurred. Please try again.")
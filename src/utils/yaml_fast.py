@@ -0,0 +1,44 @@
+import os
+import threading
+import yaml
+from types import MappingProxyType
+from typing import Any, Callable, Dict, Tuple
+
+# libyaml's C loader is an order of magnitude faster; fall back when PyYAML
+# was built without it
+try:
+    from yaml import CSafeLoader as _Loader
+except ImportError:
+    from yaml import SafeLoader as _Loader
+
+def load(stream):
+    """Safely parse YAML from a string or file, using libyaml when available"""
+    return yaml.load(stream, Loader=_Loader)
+
+def freeze(value: Any) -> Any:
+    """Read-only copy of parsed YAML: mappings become MappingProxyType and lists tuples, recursively"""
+    if isinstance(value, dict):
+        return MappingProxyType({key: freeze(item) for key, item in value.items()})
+    if isinstance(value, list):
+        return tuple(freeze(item) for item in value)
+    return value
+
+# Built configs keyed by (path, build) -> (mtime, config); rebuilt only when the file changes
+_CACHE: Dict[Tuple[str, Callable], Tuple[float, Any]] = {}
+_CACHE_LOCK = threading.Lock()
+
+def load_cached(path: str, build: Callable[[Any], Any] = lambda data: data) -> Any:
+    """Parse the YAML file at path through build, reusing the result until the file's mtime changes"""
+    path = os.path.abspath(path)
+    mtime = os.path.getmtime(path)
+    key = (path, build)
+    with _CACHE_LOCK:
+        cached = _CACHE.get(key)
+    if cached and cached[0] == mtime:
+        return cached[1]
+    
+    with open(path, 'r') as f:
+        config = build(load(f))
+    with _CACHE_LOCK:
+        _CACHE[key] = (mtime, config)
+    return config
@@ -0,0 +1,62 @@
+import pytest
+from unittest.mock import patch, MagicMock, create_autospec
+import numpy as np
+from pinecone.grpc import GRPCIndex
+from pinecone.models.vectors.responses import FetchByMetadataResponse, UpsertResponse
+from src.pinecone_ops import operations, embedding_cache
+from src.pinecone_ops.embedding_cache import EmbeddingCache
+from src.pinecone_ops.operations import PineconeOperations, EMBEDDING_DIMENSION
+from src.utils.embeddings import embedding_model_id
+
+def _fake_embedding(text: str) -> np.ndarray:
+    # Deterministic per-text embedding so different texts get different vectors
+    return np.full(EMBEDDING_DIMENSION, len(text) / 100, dtype=np.float32)
+
+# Mock the pinecone library
+@pytest.fixture(scope="session")
+def mock_pinecone():
+    with patch('src.pinecone_ops.operations.PineconeGRPC') as mock_pc:
+        # Index handles follow the installed SDK's signatures, so API drift fails loudly
+        mock_pc.return_value.Index.side_effect = lambda *args, **kwargs: create_autospec(GRPCIndex, instance=True)
+        yield mock_pc
+
+# Mock the local embedding model
+@pytest.fixture(scope="session")
+def mock_embedding_model(tmp_path_factory):
+    model = MagicMock()
+    model.encode.side_effect = lambda texts, **kwargs: (
+        _fake_embedding(texts) if isinstance(texts, str)
+        else np.stack([_fake_embedding(text) for text in texts])
+    )
+    cache_path = tmp_path_factory.mktemp('cache') / 'embeddings.sqlite3'
+    with patch.object(operations, '_MODEL', None), \
+            patch.object(embedding_cache, '_cache', EmbeddingCache(str(cache_path))), \
+            patch('src.pinecone_ops.operations.load_embedding_model', return_value=model):
+        yield model
+    operations._embed_cached.cache_clear()
+
+@pytest.fixture(scope="session")
+def pinecone_ops(mock_pinecone, mock_embedding_model):
+    return PineconeOperations(
+        api_key="test_key",
+        environment="test_env"
+    )
+
+@pytest.fixture(autouse=True)
+def reset_pinecone_ops(request):
+    """Give each test a clean view of the shared PineconeOperations and its mocks"""
+    if 'pinecone_ops' not in request.fixturenames:
+        yield
+        return
+
+    ops = request.getfixturevalue('pinecone_ops')
+    operations._embed_cached.cache_clear()
+    embedding_cache.purge_model(embedding_model_id())
+    request.getfixturevalue('mock_embedding_model').reset_mock()
+    for index in (ops.base.job_index, ops.base.content_index):
+        index.reset_mock(return_value=True, side_effect=True)
+        index.upsert.side_effect = lambda vectors, **kwargs: UpsertResponse(upserted_count=len(vectors))
+        index.fetch_by_metadata.return_value = FetchByMetadataResponse()
+    ops.research_manager._job_cache.clear()
+    ops.content_manager._query_cache.clear()
+    yield
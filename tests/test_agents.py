@@ -0,0 +1,107 @@
+import pytest
+from unittest.mock import patch, MagicMock
+from src.agents import rate_limit
+from src.agents.rate_limit import TokenBucket, get_retry_after, retry_delay
+
+# Fake clock: sleeping advances monotonic time instead of blocking
+@pytest.fixture
+def clock():
+    state = {'now': 1000.0, 'sleeps': []}
+
+    def sleep(seconds):
+        state['sleeps'].append(seconds)
+        state['now'] += seconds
+
+    with patch.object(rate_limit.time, 'monotonic', side_effect=lambda: state['now']), \
+            patch.object(rate_limit.time, 'sleep', side_effect=sleep):
+        yield state
+
+def test_token_bucket_admits_within_budget(clock):
+    """Test calls within both budgets are admitted without waiting"""
+    bucket = TokenBucket(rpm=3, tpm=1000)
+    for _ in range(3):
+        bucket.wait_for(100)
+    assert clock['sleeps'] == []
+
+def test_token_bucket_blocks_on_request_budget(clock):
+    """Test the call over the RPM budget waits for the oldest request to expire"""
+    bucket = TokenBucket(rpm=2, tpm=1000)
+    bucket.wait_for(10)
+    clock['now'] += 15
+    bucket.wait_for(10)
+    bucket.wait_for(10)
+    assert clock['sleeps'] == [45]
+
+def test_token_bucket_blocks_on_token_budget(clock):
+    """Test the call over the TPM budget waits until enough tokens age out"""
+    bucket = TokenBucket(rpm=30, tpm=1000)
+    bucket.wait_for(600)
+    clock['now'] += 20
+    bucket.wait_for(300)
+    bucket.wait_for(300)
+    assert clock['sleeps'] == [40]
+
+def test_token_bucket_sleeps_unlocked(clock):
+    """Test a throttled caller does not hold the lock while it waits"""
+    bucket = TokenBucket(rpm=1, tpm=1000)
+    bucket.wait_for(10)
+    lock_free = []
+
+    def sleep(seconds):
+        # Other callers, including record(), must be able to take the lock mid-wait
+        lock_free.append(bucket._lock.acquire(blocking=False))
+        if lock_free[-1]:
+            bucket._lock.release()
+        clock['now'] += seconds
+
+    with patch.object(rate_limit.time, 'sleep', side_effect=sleep):
+        bucket.wait_for(10)
+    assert lock_free == [True]
+
+def test_token_bucket_record_replaces_reservation(clock):
+    """Test recorded usage replaces the estimate when charging the budget"""
+    bucket = TokenBucket(rpm=30, tpm=1000)
+    reservation = bucket.wait_for(900)
+    bucket.record(reservation, 100)
+    bucket.wait_for(800)
+    assert clock['sleeps'] == []
+
+    # Usage above the estimate is charged too
+    bucket.record(reservation, 900)
+    bucket.wait_for(100)
+    assert clock['sleeps'] == [60]
+
+def test_retry_after_from_headers():
+    """Test the Retry-After response header takes precedence"""
+    error = Exception("rate_limit_exceeded: Please try again in 5s")
+    error.response = MagicMock(headers={'retry-after': '12'})
+    assert get_retry_after(error) == 12.0
+
+@pytest.mark.parametrize("message, expected", [
+    ("Rate limit reached. Please try again in 1m2.5s.", 62.5),
+    ("Rate limit reached. Please try again in 7.25s.", 7.25),
+    ("{'retry-after': '3'}", 3.0),
+    ("Rate limit reached. Please try again in 640ms.", None),
+    ("rate_limit_exceeded", None),
+])
+def test_retry_after_from_message(message, expected):
+    """Test the wait is parsed from Groq's error text when no header is present"""
+    assert get_retry_after(Exception(message)) == expected
+
+def test_retry_delay_prefers_retry_after():
+    """Test a provider-requested wait is used as-is"""
+    assert retry_delay(3, Exception("Please try again in 45.5s")) == 45.5
+
+def test_retry_delay_caps_retry_after():
+    """Test an excessive provider-requested wait is capped"""
+    error = Exception("rate_limit_exceeded")
+    error.response = MagicMock(headers={'retry-after': '86400'})
+    assert retry_delay(0, error) == rate_limit.MAX_RETRY_DELAY
+    assert retry_delay(0, Exception("Please try again in 1m2.5s")) == rate_limit.MAX_RETRY_DELAY
+
+def test_retry_delay_backoff():
+    """Test unparseable waits fall back to jittered exponential backoff, capped"""
+    with patch.object(rate_limit.random, 'uniform', return_value=0.5):
+        assert retry_delay(0, Exception("Please try again in 640ms")) == rate_limit.BASE_RETRY_DELAY + 0.5
+        assert retry_delay(2, Exception("rate_limit_exceeded")) == rate_limit.BASE_RETRY_DELAY * 4 + 0.5
+        assert retry_delay(10, Exception("rate_limit_exceeded")) == rate_limit.MAX_RETRY_DELAY
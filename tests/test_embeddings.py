@@ -1,35 +1,58 @@
-import pytest
-from unittest.mock import patch
-from src.pinecone_ops.operations import PineconeOperations
-
-# Mock the google.generativeai library
-@pytest.fixture
-def mock_google_genai():
-    with patch('google.generativeai.configure'), patch('google.generativeai.embed_content') as mock_embed:
-        # Return a different embedding each time to test consistency logic if needed
-        mock_embed.side_effect = [{"embedding": [0.1] * 768}, {"embedding": [0.1] * 768}, {"embedding": [0.2] * 768}]
-        yield mock_embed
-
-@pytest.fixture
-def pinecone_ops(mock_google_genai):
-    with patch('pinecone.init'), patch('pinecone.list_indexes'), patch('pinecone.create_index'), patch('pinecone.Index'):
-        return PineconeOperations(
-            api_key="test_key",
-            environment="test_env",
-            google_api_key="test_google_api_key"
-        )
-
-def test_embedding_consistency(pinecone_ops):
+import numpy as np
+from src.pinecone_ops import operations
+from src.pinecone_ops.operations import EMBEDDING_DIMENSION
+
+def test_embedding_consistency(pinecone_ops, mock_embedding_model):
     """Test embedding generation consistency"""
     text = "This is a test sentence for embedding"
-    embedding1 = pinecone_ops.research_manager._generate_embedding(text)
-    embedding2 = pinecone_ops.research_manager._generate_embedding(text)
-    
+    embedding1 = pinecone_ops.base._generate_embedding(text)
+    embedding2 = pinecone_ops.base._generate_embedding(text)
+
     # Embeddings should be identical for same text
-    assert embedding1 == embedding2
-    assert len(embedding1) == 768  # Gemini embedding-001 dimensions
+    embedding1 = np.asarray(embedding1, dtype=np.float32)
+    assert np.array_equal(embedding1, np.asarray(embedding2, dtype=np.float32))
+    assert len(embedding1) == EMBEDDING_DIMENSION  # all-MiniLM-L6-v2 dimensions
 
     # A different text should have a different embedding
     text3 = "This is a different sentence."
-    embedding3 = pinecone_ops.research_manager._generate_embedding(text3)
-    assert embedding1 != embedding3
+    embedding3 = pinecone_ops.base._generate_embedding(text3)
+    assert not np.array_equal(embedding1, np.asarray(embedding3, dtype=np.float32))
+
+    # The repeated text is served from the cache: one encode per distinct text
+    assert mock_embedding_model.encode.call_count == 2
+
+def test_embedding_disk_cache(pinecone_ops, mock_embedding_model):
+    """Test embeddings persist across in-memory cache resets"""
+    text = "Persisted sentence"
+    embedding1 = pinecone_ops.base._generate_embedding(text)
+
+    # Simulate a restart: the in-process cache is empty, the disk cache is not
+    operations._embed_cached.cache_clear()
+    embedding2 = pinecone_ops.base._generate_embedding(text)
+
+    # The disk cache stores int8-quantized vectors: equal within one quantization step
+    embedding1 = np.asarray(embedding1, dtype=np.float32)
+    assert np.allclose(embedding1, np.asarray(embedding2, dtype=np.float32), rtol=0, atol=np.abs(embedding1).max() / 127)
+    assert mock_embedding_model.encode.call_count == 1
+
+def test_onnx_encode_options():
+    """Test the ONNX model honors normalize_embeddings and the model's hidden size"""
+    from types import SimpleNamespace
+    from unittest.mock import MagicMock
+    from src.utils.embeddings import OnnxEmbeddingModel
+
+    model = OnnxEmbeddingModel.__new__(OnnxEmbeddingModel)
+    model.max_seq_length = 256
+    model.tokenizer = MagicMock(side_effect=lambda texts, **kwargs: {
+        'attention_mask': np.ones((len(texts), 2), dtype=np.int64)
+    })
+    model.model = MagicMock(side_effect=lambda **inputs: SimpleNamespace(
+        last_hidden_state=np.full((len(inputs['attention_mask']), 2, 4), 3.0, dtype=np.float32)
+    ))
+    model.model.config.hidden_size = 4
+
+    assert np.allclose(model.encode("text"), [3.0] * 4)
+    assert np.allclose(model.encode("text", normalize_embeddings=True), [0.5] * 4)
+    assert model.encode(["a", "b", "c"], batch_size=2).shape == (3, 4)
+    assert isinstance(model.encode(["a"], convert_to_numpy=False), list)
+    assert model.encode([]).shape == (0, 4)
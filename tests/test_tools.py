@@ -0,0 +1,44 @@
+import pytest
+
+pytest.importorskip("crewai")
+
+from src.tools.serpapi_search_tool import SerpAPISearchTool
+
+@pytest.fixture
+def search_tool():
+    return SerpAPISearchTool(api_key="test_key")
+
+def test_format_results(search_tool):
+    """Test SerpAPI results are mapped to sources scored by position"""
+    formatted = search_tool._format_results({
+        'organic_results': [
+            {'link': "a.com", 'title': "A", 'snippet': "Alpha", 'position': 1},
+            {'link': "b.com", 'title': "B", 'snippet': "Beta", 'position': 4},
+            {'link': "c.com", 'position': 250},
+            {'title': "No position"}
+        ]
+    })
+
+    assert formatted[0] == {
+        'url': "a.com", 'title': "A", 'snippet': "Alpha", 'content': "Alpha", 'relevance_score': 1.0
+    }
+    assert formatted[1]['relevance_score'] == 0.25
+    # Positions past the precomputed table share the last entry
+    assert formatted[2]['relevance_score'] == 1 / 100
+    assert (formatted[2]['title'], formatted[2]['snippet'], formatted[2]['content']) == ("", "", "")
+    assert (formatted[3]['url'], formatted[3]['relevance_score']) == ("", 1.0)
+
+def test_format_results_clamps_low_positions(search_tool):
+    """Test zero, negative and null positions score like the top result"""
+    formatted = search_tool._format_results({
+        'organic_results': [
+            {'link': "a.com", 'position': 0},
+            {'link': "b.com", 'position': -3},
+            {'link': "c.com", 'position': None}
+        ]
+    })
+    assert [result['relevance_score'] for result in formatted] == [1.0, 1.0, 1.0]
+
+def test_format_results_empty(search_tool):
+    """Test a response without organic results yields no sources"""
+    assert search_tool._format_results({}) == []
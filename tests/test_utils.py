@@ -0,0 +1,39 @@
+import os
+import pytest
+from src.utils import yaml_fast
+from src.utils.config import PineconeCfg, PineconeConfigManager
+
+def test_freeze_is_recursive():
+    """Test nested mappings and lists in parsed YAML become read-only"""
+    frozen = yaml_fast.freeze({'agent': {'role': "Researcher", 'tools': ["search", {'name': "scrape"}]}})
+
+    with pytest.raises(TypeError):
+        frozen['agent']['role'] = "Writer"
+    with pytest.raises(TypeError):
+        frozen['agent']['tools'][1]['name'] = "fetch"
+    assert frozen['agent']['tools'][0] == "search"
+    assert isinstance(frozen['agent']['tools'], tuple)
+
+def test_load_cached_reloads_on_change(tmp_path):
+    """Test a cached config is reused until the file's mtime changes"""
+    path = tmp_path / "config.yaml"
+    path.write_text("agent:\n  role: Researcher\n")
+
+    config = yaml_fast.load_cached(str(path), yaml_fast.freeze)
+    assert yaml_fast.load_cached(str(path), yaml_fast.freeze) is config
+    assert config['agent']['role'] == "Researcher"
+
+    path.write_text("agent:\n  role: Writer\n")
+    mtime = os.path.getmtime(path) + 5
+    os.utime(path, (mtime, mtime))
+    assert yaml_fast.load_cached(str(path), yaml_fast.freeze)['agent']['role'] == "Writer"
+
+def test_pinecone_config_empty_file(tmp_path):
+    """Test an empty config file falls back to the default configuration"""
+    path = tmp_path / "pinecone_indexes.yaml"
+    path.write_text("")
+
+    manager = PineconeConfigManager(str(path))
+    assert manager.config == PineconeCfg.from_dict(manager.get_default_config())
+    assert manager.load_config() is manager.config
+    assert PineconeCfg.from_dict(None).indexes == {}